@@ -4,70 +4,267 @@ Convert JSON5 format to standard JSON
 Handles comments, trailing commas, and unquoted keys
 """
 import re
+import os
 import sys
 import json
+import mmap
+import shutil
+import hashlib
+import tempfile
+
+try:
+    # Optional: faster validation when orjson is installed. Its
+    # JSONDecodeError subclasses json.JSONDecodeError.
+    from orjson import loads as _validate_json
+except ImportError:
+    from json import loads as _validate_json
+
+# Converted output of unchanged input files is cached here. The output
+# contains everything in the config, credentials included, so the
+# directory and its files are private to the user. There is one entry per
+# input file, replaced when the file changes, and at most _CACHE_MAX
+# entries in all.
+_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'json5_to_json',
+)
+_CACHE_MAX = 16
+
+# Whitespace with any comments in it: the gap allowed between a key's
+# context ({, comma or line start) and the key, between the key and its
+# colon, and after a trailing comma
+_GAP = rb'\s*(?:(?://[^\n]*\n|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/)\s*)*'
+
+# One alternation covering every JSON5 construct the converter rewrites.
+# String literals come first so that comment markers, commas and colons
+# inside them are left alone. Every alternative starts with a literal
+# character, which lets the regex engine skip straight to candidate
+# positions. String bodies, block comments and the whitespace before a
+# closing bracket are written as runs of ordinary characters broken only
+# by the one character that matters (an escape, a '*', a comment), so
+# the engine consumes each run in one tight loop instead of trying an
+# alternation per character. Spelling out whole comments also keeps the
+# trailing-comma lookahead from backtracking onto a } or ] inside one.
+# No alternative can match the same text two ways, so the scan stays
+# linear; a DFA engine such as RE2 has no lookahead and, through its
+# Python binding, runs this kind of token-heavy scan several times slower.
+_JSON5_TOKEN = re.compile(rb'''
+    "[^"\\\n]*(?:\\.[^"\\\n]*)*" | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+  | /(?P<comment>/[^\n]*|\*[^*]*\*+(?:[^/*][^*]*\*+)*/)
+  | ,(?:
+        (?P<comma>)(?=%(gap)b[}\]])
+      | %(gap)b(?P<key_after_comma>[a-zA-Z_][a-zA-Z0-9_]*)%(gap)b:
+    )
+  | \{%(gap)b(?P<key_after_brace>[a-zA-Z_][a-zA-Z0-9_]*)%(gap)b:
+  | \n%(gap)b(?P<key>[a-zA-Z_][a-zA-Z0-9_]*)%(gap)b:
+''' % {b'gap': _GAP}, re.VERBOSE)
+
+# Comments inside the gap before a key, removed when the key is quoted
+_GAP_COMMENT = re.compile(rb'//[^\n]*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/')
+
+# Cheap pre-check ignoring string boundaries: anything that looks like a
+# comment, trailing comma or unquoted key. A false positive (e.g. a URL
+# inside a string) only means the full scan runs; if this finds nothing
+# the input is already plain JSON.
+_NEEDS_CLEANUP = re.compile(rb'''
+    /[/*]
+  | ,\s*(?:[}\]]|[a-zA-Z_][a-zA-Z0-9_]*\s*:)
+  | \{\s*[a-zA-Z_][a-zA-Z0-9_]*\s*:
+  | \n\s*[a-zA-Z_][a-zA-Z0-9_]*\s*:
+''', re.VERBOSE)
+
+def _clean(data, view):
+    """Rewrite the JSON5 tokens in bytes-like data, slicing kept text from view"""
+    # Single forward scan: copy everything between tokens verbatim,
+    # drop comments (but not URLs with // inside strings) and trailing
+    # commas before } or ], and quote unquoted keys (key: -> "key":) at
+    # the start of a line or right after { or ,
+    out = []
+    pos = 0
+    for match in _JSON5_TOKEN.finditer(data):
+        kind = match.lastgroup
+        if kind is None:
+            # String literal, copied verbatim with the surrounding text
+            continue
+        if kind.startswith('key'):
+            # Keep the context and whitespace before the key, minus any
+            # comments; everything between the key and its colon goes
+            start = match.start()
+            out.append(view[pos:start])
+            lead = match.group()[:match.start(kind) - start]
+            out.append(_GAP_COMMENT.sub(b'', lead) if b'/' in lead else lead)
+            out.append(b'"' + match.group(kind) + b'":')
+        else:
+            out.append(view[pos:match.start()])
+        pos = match.end()
+    out.append(view[pos:])
+
+    return b''.join(out)
 
 def convert_json5_to_json(content):
     """Convert JSON5 content to valid JSON"""
-    # Remove single-line comments (but not URLs with //)
-    lines = content.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        # Check if line contains a comment
-        # Only remove // if it's not inside a string
-        in_string = False
-        quote_char = None
-        comment_start = -1
-
-        for i, char in enumerate(line):
-            if char in ('"', "'") and (i == 0 or line[i-1] != '\\'):
-                if not in_string:
-                    in_string = True
-                    quote_char = char
-                elif char == quote_char:
-                    in_string = False
-                    quote_char = None
-            elif char == '/' and i < len(line) - 1 and line[i+1] == '/' and not in_string:
-                comment_start = i
-                break
+    # JSON5 syntax is pure ASCII, so the scan runs over the UTF-8 encoding:
+    # one byte per character, however wide the str's own storage is
+    return convert_json5_to_json_bytes(content.encode('utf-8')).decode('utf-8')
 
-        if comment_start >= 0:
-            cleaned_lines.append(line[:comment_start])
-        else:
-            cleaned_lines.append(line)
+def convert_json5_to_json_bytes(data):
+    """Convert UTF-8 encoded JSON5 (bytes, bytearray or mmap) to JSON bytes"""
+    if not _NEEDS_CLEANUP.search(data):
+        return bytes(data)
+    # Zero-copy memoryview slices let join size the result once and copy
+    # each kept span straight into it
+    with memoryview(data) as view:
+        return _clean(data, view)
+
+def convert_file(path):
+    """Convert a JSON5 file to JSON bytes"""
+    # Map the file instead of reading it so the scan works directly on
+    # the page cache
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return b''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return convert_json5_to_json_bytes(mm)
 
-    content = '\n'.join(cleaned_lines)
+def convert_paths(paths):
+    """Convert many JSON5 files in parallel, returning JSON bytes in order"""
+    paths = list(paths)
+    if len(paths) < 2:
+        return [convert_file(path) for path in paths]
+    # The regex scan holds the GIL, so only separate processes put more
+    # than one core to work on it. Imported here to keep multiprocessing
+    # out of the single-file command line startup.
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as ex:
+        return list(ex.map(convert_file, paths))
 
-    # Remove multi-line comments
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+def _converter_digest():
+    """Hash of this script, so output from another version is never reused"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).digest()
 
-    # Quote unquoted keys (key: value -> "key": value)
-    # Match word characters followed by colon, not inside quotes
-    content = re.sub(r'(\n\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', content)
+def _cache_entry(input_file, st):
+    """(cache file, stamp) for this input path at this size and modification time
+    
+    The cache file name depends only on the path; the stamp, stored as the
+    file's first line, on everything that decides the output.
+    """
+    path = os.path.abspath(input_file)
+    name = hashlib.blake2b(path.encode(), digest_size=16).hexdigest()
+    stamp = hashlib.blake2b(
+        f"{path}|{st.st_size}|{st.st_mtime_ns}".encode() + _converter_digest(),
+        digest_size=16,
+    ).hexdigest().encode() + b'\n'
+    return os.path.join(_CACHE_DIR, name), stamp
 
-    # Remove trailing commas before } or ]
-    content = re.sub(r',(\s*[}\]])', r'\1', content)
+def _open_cached(cache_path, stamp):
+    """Open a cache entry positioned after its stamp, or None if it is stale"""
+    try:
+        f = open(cache_path, 'rb')
+    except OSError:
+        return None
+    if f.read(len(stamp)) != stamp:
+        f.close()
+        return None
+    return f
+
+def _write_cache(cache_path, stamp, output):
+    """Store converted output atomically; failures only disable caching"""
+    try:
+        os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_CACHE_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(stamp)
+                f.write(output)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+        _prune_cache()
+    except OSError:
+        pass
 
-    return content
+def _prune_cache():
+    """Remove the least recently written entries beyond _CACHE_MAX"""
+    with os.scandir(_CACHE_DIR) as it:
+        entries = [entry for entry in it if entry.is_file(follow_symlinks=False)]
+    if len(entries) <= _CACHE_MAX:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+    for entry in entries[:-_CACHE_MAX]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
+def _copy_to_stdout(f):
+    """Copy the rest of an open binary file to stdout, in the kernel where possible"""
+    sys.stdout.buffer.flush()
+    out_fd = sys.stdout.fileno()
+    in_fd = f.fileno()
+    size = os.fstat(in_fd).st_size
+    start = offset = f.tell()
+    try:
+        while offset < size:
+            sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+            if not sent:
+                break
+            offset += sent
+    except (AttributeError, OSError):
+        # No sendfile for this kind of stdout (or platform)
+        if offset != start:
+            raise
+        shutil.copyfileobj(f, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: json5_to_json.py <input_file>", file=sys.stderr)
+    args = sys.argv[1:]
+    validate = '--no-validate' not in args
+    if not validate:
+        args.remove('--no-validate')
+    if len(args) != 1:
+        print("Usage: json5_to_json.py [--no-validate] <input_file>", file=sys.stderr)
         sys.exit(1)
 
-    input_file = sys.argv[1]
+    input_file = args[0]
 
     try:
-        with open(input_file, 'r') as f:
-            content = f.read()
+        st = os.stat(input_file)
+        cache_path, stamp = _cache_entry(input_file, st)
+        cached = _open_cached(cache_path, stamp)
+        if cached is not None:
+            with cached:
+                _copy_to_stdout(cached)
+            sys.exit(0)
+
+        if not validate:
+            # Input that is already plain JSON goes to stdout straight from
+            # the file, without ever being copied into the process
+            with open(input_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        plain = not _NEEDS_CLEANUP.search(mm)
+                    if plain:
+                        _copy_to_stdout(f)
+                        sys.stdout.buffer.write(b'\n')
+                        sys.stdout.buffer.flush()
+                        sys.exit(0)
 
-        json_content = convert_json5_to_json(content)
+        json_bytes = convert_file(input_file)
 
-        # Validate the JSON
-        json.loads(json_content)
+        output = json_bytes + b'\n'
+        if validate:
+            # Validate the JSON (both parsers accept UTF-8 bytes directly).
+            # Only validated output is cached, so a cache hit never skips
+            # validation that was asked for.
+            _validate_json(json_bytes)
+            _write_cache(cache_path, stamp, output)
 
-        # Output the converted JSON
-        print(json_content)
+        # Output the converted JSON as-is, without a decode/re-encode
+        # round-trip through text-mode stdout
+        sys.stdout.buffer.write(output)
+        sys.stdout.buffer.flush()
 
     except FileNotFoundError:
         print(f"Error: File '{input_file}' not found", file=sys.stderr)
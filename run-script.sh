@@ -44,33 +44,69 @@ import json
 with open('$input_file', 'r') as f:
     content = f.read()
 
-# Remove single-line comments (but not URLs with //)
-lines = content.split('\n')
-cleaned_lines = []
-for line in lines:
-    in_string = False
-    quote_char = None
-    comment_start = -1
+quote_re = re.compile('[\"\\']')
 
-    for i, char in enumerate(line):
-        if char in ('\"', \"'\") and (i == 0 or line[i-1] != '\\\\'):
-            if not in_string:
-                in_string = True
-                quote_char = char
-            elif char == quote_char:
-                in_string = False
-                quote_char = None
-        elif char == '/' and i < len(line) - 1 and line[i+1] == '/' and not in_string:
-            comment_start = i
+# Remove single-line comments (but not URLs with //)
+# Walk the content line by line in place and only cut out the comments,
+# instead of splitting it into a list of lines and joining it back
+out = []
+keep_start = 0
+pos = 0
+while pos <= len(content):
+    nl = content.find('\n', pos)
+    line_end = len(content) if nl < 0 else nl
+    # Jump between '//' markers and string openings with str.find and a
+    # regex search rather than stepping through every character
+    i = pos
+    while i < line_end:
+        comment = content.find('//', i, line_end)
+        if comment < 0:
             break
+        quote = quote_re.search(content, i, comment)
+        if quote is None:
+            out.append(content[keep_start:comment])
+            keep_start = line_end
+            break
+
+        # Skip the string literal that opens before the marker. A quote
+        # closes it unless preceded by an odd run of backslashes.
+        quote_char = quote.group()
+        i = quote.end()
+        while True:
+            end = content.find(quote_char, i, line_end)
+            if end < 0:
+                i = line_end
+                break
+            escapes = 0
+            while content[end - 1 - escapes] == '\\\\':
+                escapes += 1
+            i = end + 1
+            if escapes % 2 == 0:
+                break
 
-    if comment_start >= 0:
-        cleaned_lines.append(line[:comment_start])
-    else:
-        cleaned_lines.append(line)
+    pos = line_end + 1
+
+out.append(content[keep_start:])
+content = ''.join(out)
+
+# Remove block comments, splicing around them with str.find. Most
+# configs have none, so the check alone usually settles it.
+if '/*' in content:
+    out = []
+    pos = 0
+    while True:
+        start = content.find('/*', pos)
+        if start < 0:
+            break
+        end = content.find('*/', start + 2)
+        if end < 0:
+            # Unterminated comment, kept as is
+            break
+        out.append(content[pos:start])
+        pos = end + 2
+    out.append(content[pos:])
+    content = ''.join(out)
 
-content = '\n'.join(cleaned_lines)
-content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
 content = re.sub(r'(\n\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1\"\2\":', content)
 content = re.sub(r',(\s*[}\]])', r'\1', content)
 
@@ -256,7 +292,7 @@ jq -c '.repositories[]' "$CONFIG_FILE" | while read -r repo_json; do
     fi
     
     # Clone
-    echo "[STEP 1/5] Cloning repository..."
+    echo "[STEP 1/4] Cloning repository..."
     cd "$TMP_DIR"
 
     # Try to clone - first attempt with dev branch, then try without specifying branch
@@ -277,7 +313,7 @@ jq -c '.repositories[]' "$CONFIG_FILE" | while read -r repo_json; do
     cd "$repo_name"
     
     # Fetch tags
-    echo "[STEP 2/5] Fetching tags..."
+    echo "[STEP 2/4] Fetching tags..."
     if git fetch --tags; then
         echo "[SUCCESS] Tags fetched successfully"
     else
@@ -286,23 +322,10 @@ jq -c '.repositories[]' "$CONFIG_FILE" | while read -r repo_json; do
         continue
     fi
     
-    # Delete existing tag
-    echo "[STEP 3/5] Deleting existing tag '$VERSION' (if exists)..."
-    if git tag -d "$VERSION" 2>/dev/null; then
-        echo "[INFO] Local tag deleted"
-    else
-        echo "[INFO] No local tag to delete"
-    fi
-    
-    if git push --delete origin "$VERSION" 2>/dev/null; then
-        echo "[INFO] Remote tag deleted"
-    else
-        echo "[INFO] No remote tag to delete"
-    fi
-    
-    # Create new tag
-    echo "[STEP 4/5] Creating new tag '$VERSION'..."
-    if git tag "$VERSION" HEAD; then
+    # Create new tag; -f moves a local tag brought in by the fetch above
+    # instead of deleting it with a separate git tag -d first
+    echo "[STEP 3/4] Creating new tag '$VERSION'..."
+    if git tag -f "$VERSION" HEAD >/dev/null; then
         echo "[SUCCESS] Tag created successfully"
     else
         echo "[ERROR] Failed to create tag: $repo_name"
@@ -310,9 +333,10 @@ jq -c '.repositories[]' "$CONFIG_FILE" | while read -r repo_json; do
         continue
     fi
     
-    # Push tag
-    echo "[STEP 5/5] Pushing tag to remote..."
-    if git push origin "$VERSION"; then
+    # Push tag; the forced update replaces an existing remote tag in the
+    # same push instead of a separate delete round-trip first
+    echo "[STEP 4/4] Pushing tag to remote..."
+    if git push origin "+refs/tags/$VERSION:refs/tags/$VERSION"; then
         echo "[SUCCESS] Tag pushed successfully"
         success_count=$((success_count + 1))
     else
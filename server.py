@@ -5,7 +5,7 @@ Serves static files and uses Git commands to fetch repository tags
 Automatically reloads config when config.json5 changes
 """
 
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import subprocess
 import json
 import sys
@@ -14,116 +14,676 @@ import tempfile
 import shutil
 import re
 import time
-from urllib.parse import urlparse, parse_qs, quote
+import threading
+import functools
+import contextlib
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import signal
+import logging
+import logging.handlers
+import queue
+import base64
+import http.client
+from urllib.parse import urlparse, urlsplit, parse_qs, quote
+from email.utils import formatdate, parsedate_to_datetime
+
+# One scratch directory per server process; git operations that need a
+# repository on disk work in their own subdirectory of it. It follows
+# TMPDIR, so pointing that at a tmpfs keeps all git I/O in memory. That
+# is not the default: /dev/shm is often small (64 MB in a Docker
+# container), and once it is full every clone fails.
+_WORK_DIR = tempfile.mkdtemp(prefix='git-tag-server-')
+atexit.register(shutil.rmtree, _WORK_DIR, ignore_errors=True)
+
+# Server log. Messages are still formatted in the thread that logs them
+# (QueueHandler formats before queueing), but the write to stdout is left
+# to one listener thread, so a log line never waits on the terminal or
+# pipe.
+log = logging.getLogger('gittag')
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue = queue.SimpleQueue()
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+def _bulk_tag_jobs():
+    """GIT_TAG_JOBS as a positive number, 16 if it is unset or not a number"""
+    value = os.environ.get('GIT_TAG_JOBS', '16')
+    try:
+        return max(1, int(value))
+    except ValueError:
+        log.warning(f"[CONFIG] ✗ GIT_TAG_JOBS={value!r} is not a number, using 16")
+        return 16
+
+# Upper bound on repositories tagged at once by a bulk-tag request
+_BULK_TAG_JOBS = _bulk_tag_jobs()
+
+# Environment for git commands: never wait on an interactive credential
+# prompt, fail instead
+_GIT_ENV = {**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+
+# JSON5 clean-up patterns, compiled once. String literals are matched
+# (and kept) together with comments so that comment markers inside
+# strings, such as the // in URLs, are left alone.
+_JSON5_STRIP = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|//[^\n]*|/\*.*?\*/', re.DOTALL)
+_UNQUOTED_KEY = re.compile(r'(^\s*|[{,]\s*)([a-zA-Z_]\w*)(\s*):', re.MULTILINE)
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+def _strip_json5_comment(match):
+    """Keep string literals, drop comments"""
+    text = match.group()
+    return text if text[0] == '"' else ''
+
+# One commit of the git log format used by fetch_repo_commits: full and
+# short hash, author name and email, timestamp, subject, then the body
+_LOG_RE = re.compile(
+    rb'([0-9a-f]+)\n([0-9a-f]+)\n([^\n]*)\n([^\n]*)\n(\d+)\n([^\n]*)\n(.*?)\n---COMMIT-END---',
+    re.DOTALL
+)
+
+# Base URLs that already name a full Git repository, found in one scan
+_FULL_GIT_URL = re.compile(r'\.git|github\.com|gitlab\.com')
+
+def _build_api_auth(git_username, git_token):
+    """Authorization header value for the Azure DevOps REST API (None if no token)"""
+    if not git_token:
+        return None
+    # A personal access token goes in as the password; the user name
+    # may be anything
+    userpass = f"{git_username}:{git_token}".encode('utf-8')
+    return 'Basic ' + base64.b64encode(userpass).decode('ascii')
+
+@functools.lru_cache(maxsize=256)
+def _build_auth_prefix(git_username, git_token):
+    """URL-encoded credentials for the userinfo part of a Git URL ('' if none)"""
+    if git_token:
+        if git_username:
+            return f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
+        return f"{quote(git_token, safe='')}@"
+    if git_username:
+        return f"{quote(git_username, safe='')}@"
+    return ''
+
+# Git URL builders, one per kind of baseUrl. All take the same arguments
+# (base_url_clean is base_url without its scheme); _url_builder() picks
+# the one for a base URL.
+
+def _build_full(base_url, base_url_clean, project_name, repo_name, org, auth_part):
+    """baseUrl is already a full Git URL: use it directly"""
+    return f"https://{auth_part}{base_url_clean}" if auth_part else base_url
+
+def _build_vsts(base_url, base_url_clean, project_name, repo_name, org, auth_part):
+    """Format: https://{org}.visualstudio.com/{project}/_git/{repo}"""
+    return f"https://{auth_part}{base_url_clean}/{project_name}/_git/{repo_name}"
+
+def _build_azdo(base_url, base_url_clean, project_name, repo_name, org, auth_part):
+    """Format: https://dev.azure.com/{org}/{project}/_git/{repo}"""
+    if not org:
+        raise ValueError('organization required for dev.azure.com URLs')
+    if auth_part:
+        return f"https://{auth_part}{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
+    return f"https://{org}@{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
+
+@functools.lru_cache(maxsize=64)
+def _url_builder(base_url):
+    """(builder, base_url_clean) for a base URL, worked out once per URL"""
+    base_url_clean = base_url.replace('https://', '').replace('http://', '')
+    if _FULL_GIT_URL.search(base_url):
+        return _build_full, base_url_clean
+    if 'visualstudio.com' in base_url_clean:
+        return _build_vsts, base_url_clean
+    return _build_azdo, base_url_clean
+
+@functools.lru_cache(maxsize=256)
+def _build_repo_url(base_url, project_name, repo_name, org, auth_part):
+    """Build the (authenticated) Git URL for a repository
+    
+    auth_part comes from _build_auth_prefix(). Memoized, since the same
+    few repos are requested over and over. Raises ValueError for
+    dev.azure.com URLs without an organization, and for values git would
+    take as an option. The message never contains the value: handlers
+    send it back as the HTTP reason phrase.
+    """
+    for value in (base_url, project_name, repo_name, org):
+        if value.startswith('-'):
+            raise ValueError('Invalid repository parameter')
+    build, base_url_clean = _url_builder(base_url)
+    return build(base_url, base_url_clean, project_name, repo_name, org, auth_part)
+
+# Branch and tag names come straight from requests and end up on git
+# command lines, so they are checked with git's own rules first (which
+# also rule out anything starting with '-'). Valid names are remembered;
+# the same few are checked over and over. As with _build_repo_url, the
+# error message leaves the name out.
+
+@functools.lru_cache(maxsize=256)
+def _check_branch_name(branch_name):
+    """Raise ValueError unless branch_name is a valid git branch name"""
+    if not branch_name or branch_name.startswith('-') or subprocess.run(
+        ['git', 'check-ref-format', '--branch', branch_name],
+        capture_output=True
+    ).returncode != 0:
+        raise ValueError('Invalid branch name')
+
+@functools.lru_cache(maxsize=256)
+def _check_tag_name(tag_name):
+    """Raise ValueError unless tag_name is a valid git tag name"""
+    if not tag_name or tag_name.startswith('-') or subprocess.run(
+        ['git', 'check-ref-format', f'refs/tags/{tag_name}'],
+        capture_output=True
+    ).returncode != 0:
+        raise ValueError('Invalid tag name')
+
+def _azure_refs_url(base_url, project_name, repo_name, org):
+    """Azure DevOps REST endpoint for a repository's refs, or None for other hosts"""
+    build, base_url_clean = _url_builder(base_url)
+    base_url_clean = base_url_clean.rstrip('/')
+    if build is _build_vsts:
+        project_url = f"https://{base_url_clean}/{quote(project_name)}"
+    elif build is _build_azdo and 'dev.azure.com' in base_url_clean and org:
+        project_url = f"https://{base_url_clean}/{quote(org)}/{quote(project_name)}"
+    else:
+        return None
+    return f"{project_url}/_apis/git/repositories/{quote(repo_name)}/refs"
+
+# Kept-alive HTTPS connections by host, one set per thread (http.client
+# connections can't be shared between threads). API calls run on this
+# long-lived pool, so the TCP and TLS handshake is paid once per worker
+# thread rather than once per repository.
+_api_connections = threading.local()
+_API_EXECUTOR = ThreadPoolExecutor(max_workers=_BULK_TAG_JOBS, thread_name_prefix='git-tag-api')
+
+def _api_request(method, url, auth, body=None):
+    """Make an Azure DevOps REST call and return the decoded JSON response
+    
+    Raises RuntimeError for any response other than 200/201 (Azure answers
+    bad credentials with a 203 sign-in page).
+    """
+    parts = urlsplit(url)
+    connections = getattr(_api_connections, 'by_host', None)
+    if connections is None:
+        connections = _api_connections.by_host = {}
+    headers = {'Authorization': auth, 'Accept': 'application/json'}
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode()
+        headers['Content-Type'] = 'application/json'
+    
+    # A kept-alive connection may have been closed by the server since its
+    # last use, so a failure on a reused one gets a single retry
+    for attempt in range(2):
+        conn = connections.get(parts.netloc)
+        reused = conn is not None
+        if conn is None:
+            conn = connections[parts.netloc] = http.client.HTTPSConnection(parts.netloc, timeout=15)
+        try:
+            conn.request(method, f"{parts.path}?{parts.query}", body=data, headers=headers)
+            response = conn.getresponse()
+            payload = response.read()
+            break
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            del connections[parts.netloc]
+            if not reused or attempt:
+                raise
+    
+    if response.status not in (200, 201):
+        raise RuntimeError(f'{method} {parts.path} returned HTTP {response.status} {response.reason}')
+    return json.loads(payload)
+
+def _get_ref(refs_url, ref_name, auth):
+    """The ref refs/<ref_name> as the API returns it, or None if it doesn't exist"""
+    # The filter is a prefix match (heads/dev also finds heads/dev2), so
+    # the exact name is picked out of the result. peelTags adds the commit
+    # an annotated tag points at as peeledObjectId.
+    result = _api_request('GET', f"{refs_url}?filter={quote(ref_name)}&peelTags=true&api-version=7.0", auth)
+    for ref in result.get('value', []):
+        if ref['name'] == f'refs/{ref_name}':
+            return ref
+    return None
+
+def _tag_via_api(refs_url, branch_name, tag_name, auth):
+    """Point refs/tags/<tag> at the branch tip through the REST API
+    
+    Returns (success, message or error).
+    """
+    branch_ref = _get_ref(refs_url, f'heads/{branch_name}', auth)
+    if branch_ref is None:
+        return False, f'Failed to fetch branch {branch_name}: branch not found'
+    branch_sha = branch_ref['objectId']
+    tag_ref = _get_ref(refs_url, f'tags/{tag_name}', auth)
+    if tag_ref is not None and (tag_ref.get('peeledObjectId') or tag_ref['objectId']) == branch_sha:
+        return True, f'Already tagged: {tag_name} is at the tip of {branch_name}'
+    # Updating from the tag's current value (all zeros: create) moves an
+    # existing tag in the same call
+    old_sha = tag_ref['objectId'] if tag_ref is not None else '0' * 40
+    result = _api_request('POST', f"{refs_url}?api-version=7.0", auth, [{
+        'name': f'refs/tags/{tag_name}',
+        'oldObjectId': old_sha,
+        'newObjectId': branch_sha
+    }])
+    update = result['value'][0]
+    if not update.get('success'):
+        return False, f"Failed to push tag: {update.get('customMessage') or update.get('updateStatus')}"
+    return True, f'Successfully tagged {branch_name} with {tag_name}'
+
+async def _tag_matches_branch(repo_url, branch_name, tag_name):
+    """True if the remote's refs/tags/<tag> already points at the tip of <branch>
+    
+    One ls-remote; False if that fails or times out, so the caller goes on
+    and reports the real error from fetching.
+    """
+    branch_ref = f'refs/heads/{branch_name}'
+    tag_ref = f'refs/tags/{tag_name}'
+    try:
+        result = await _run_git(
+            ['git', 'ls-remote', '--', repo_url, branch_ref, tag_ref, tag_ref + '^{}'],
+            timeout=15
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    if result.returncode != 0:
+        return False
+    # Patterns match any ref ending in them, so look up the exact names. An
+    # annotated tag is listed twice; its peeled ^{} entry is the commit.
+    refs = {}
+    for line in result.stdout.splitlines():
+        sha, _, name = line.partition(b'\t')
+        refs[name] = sha
+    branch_sha = refs.get(branch_ref.encode())
+    tag_sha = refs.get(f'{tag_ref}^{{}}'.encode()) or refs.get(tag_ref.encode())
+    return branch_sha is not None and branch_sha == tag_sha
+
+# Anything that can't go into a file name: the repo name only labels its
+# scratch directory, and may be a full URL
+_UNSAFE_NAME_CHARS = re.compile(r'[^A-Za-z0-9._-]')
+
+@contextlib.contextmanager
+def _scratch_dir(prefix):
+    """Temporary directory under _WORK_DIR whose removal never raises
+    
+    A directory that can't be removed is only logged (whatever is left
+    goes with _WORK_DIR at exit); it mustn't turn a git operation that
+    already finished into an error.
+    """
+    temp = tempfile.TemporaryDirectory(prefix=prefix, dir=_WORK_DIR)
+    try:
+        yield temp.name
+    finally:
+        try:
+            temp.cleanup()
+        except OSError as e:
+            log.warning(f"[GIT] Could not remove {temp.name}: {e}")
+
+# Git commands run in a session (process group) of their own. Network
+# operations hand the transfer to helper processes (git-remote-https,
+# ssh, upload-pack) that share git's stdout and stderr; killing only git
+# on a timeout would leave those running and the pipes open.
+
+def _kill_git(proc):
+    """Kill a git command started by _run_git/_run_git_sync and its helpers"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+def _run_git_sync(args, timeout, cwd=None, text=False):
+    """Run a git command, like subprocess.run with capture_output=True
+    
+    On timeout git and all its helpers are killed and
+    subprocess.TimeoutExpired raised.
+    """
+    with subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        env=_GIT_ENV,
+        text=text,
+        start_new_session=True
+    ) as proc:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_git(proc)
+            proc.communicate()
+            raise
+    return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+async def _run_git(args, timeout, cwd=None):
+    """Run a git command without blocking the event loop
+    
+    Returns a CompletedProcess with text stderr, like subprocess.run with
+    capture_output=True; on timeout git and all its helpers are killed
+    and subprocess.TimeoutExpired raised.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        env=_GIT_ENV,
+        start_new_session=True
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        _kill_git(proc)
+        await proc.wait()
+        raise subprocess.TimeoutExpired(args, timeout)
+    except asyncio.CancelledError:
+        # The event loop is being torn down; don't leave git running
+        _kill_git(proc)
+        raise
+    return subprocess.CompletedProcess(
+        args, proc.returncode, stdout, stderr.decode('utf-8', 'replace')
+    )
+
+async def _tag_one_repo(repo_info, branch_name, tag_name, org, default_base_url, auth_part,
+                        push_refspec=None, api_auth=None):
+    """Tag one repository's branch and push the tag, returning a result dict
+    
+    push_refspec is the same for every repo of a bulk request, so callers
+    tagging many repos pass it in precomputed. With api_auth (from
+    _build_api_auth()), Azure DevOps repos are tagged through the REST API
+    instead of git.
+    """
+    if push_refspec is None:
+        push_refspec = f'+FETCH_HEAD:refs/tags/{tag_name}'
+    repo_name = repo_info['repo']
+    project_name = repo_info.get('project', repo_name)  # Default to repo name if not provided
+    base_url = repo_info.get('baseUrl', default_base_url)
+    
+    log.info(f"[BULK-TAG] Processing {repo_name}...")
+    
+    # Azure DevOps can create the tag in a few HTTP calls on a kept-alive
+    # connection: no git processes, no scratch repository. Organizations
+    # may restrict API access that git itself is still allowed, so any
+    # API failure falls back to git below.
+    refs_url = _azure_refs_url(base_url, project_name, repo_name, org) if api_auth else None
+    if refs_url:
+        api_call = asyncio.get_running_loop().run_in_executor(
+            _API_EXECUTOR, _tag_via_api, refs_url, branch_name, tag_name, api_auth
+        )
+        done, _ = await asyncio.wait([api_call], timeout=60)
+        if not done:
+            # The worker thread can't be stopped and may still create the
+            # tag; tagging through git as well would race it. Each socket
+            # operation times out well within this, so it takes a server
+            # that trickles its responses to get here.
+            api_call.cancel()
+            log.warning(f"[BULK-TAG] ✗ {repo_name}: REST API timed out")
+            return {
+                'repo': repo_name,
+                'success': False,
+                'error': 'REST API timed out; the tag may or may not have been created'
+            }
+        try:
+            success, text = api_call.result()
+        except Exception as e:
+            log.warning(f"[BULK-TAG] REST API unavailable for {repo_name} ({e or type(e).__name__}), using git")
+        else:
+            if not success:
+                return {
+                    'repo': repo_name,
+                    'success': False,
+                    'error': text
+                }
+            log.info(f"[BULK-TAG] ✓ {repo_name}: {text}")
+            return {
+                'repo': repo_name,
+                'success': True,
+                'message': text
+            }
+    
+    try:
+        repo_url = _build_repo_url(base_url, project_name, repo_name, org, auth_part)
+        
+        # Bare repository: cleanup only removes a handful of files
+        with _scratch_dir(f"git-tag-{_UNSAFE_NAME_CHARS.sub('_', repo_name)[:40]}-") as temp_dir:
+            # Re-runs find most repos tagged already; one ls-remote then
+            # saves the fetch and the push
+            if await _tag_matches_branch(repo_url, branch_name, tag_name):
+                log.info(f"[BULK-TAG] ✓ {repo_name} already tagged")
+                return {
+                    'repo': repo_name,
+                    'success': True,
+                    'message': f'Already tagged: {tag_name} is at the tip of {branch_name}'
+                }
+            
+            # The tag is created by pushing the branch tip straight to
+            # refs/tags/<tag>; that needs the tip commit locally (a push can
+            # only send objects it has), so fetch just that one commit into
+            # an empty bare repository. Nothing reads file contents, so no
+            # blobs are fetched; servers without partial clone support
+            # ignore the filter and send them anyway. The repository is
+            # thrown away right after, so skip the automatic maintenance
+            # run (an extra git process) fetch would otherwise start. That
+            # is a config setting rather than --no-auto-gc (git 2.23+):
+            # older git ignores it and fetches all the same.
+            init_result = await _run_git(['git', 'init', '--bare', '-q', temp_dir], timeout=10)
+            init_result.check_returncode()
+            fetch_result = await _run_git(
+                ['git', '-c', 'maintenance.auto=false', 'fetch', '-q', '--no-tags', '--depth', '1',
+                 '--filter=blob:none', '--', repo_url, branch_name],
+                timeout=60,
+                cwd=temp_dir
+            )
+            
+            if fetch_result.returncode != 0:
+                return {
+                    'repo': repo_name,
+                    'success': False,
+                    'error': f'Failed to fetch branch {branch_name}: {fetch_result.stderr}'
+                }
+            
+            # Create the tag on the remote at the fetched commit. The forced
+            # update replaces an existing tag in the same push, instead of a
+            # separate delete connection first.
+            push_result = await _run_git(
+                ['git', 'push', '--', repo_url, push_refspec],
+                timeout=30,
+                cwd=temp_dir
+            )
+            
+            if push_result.returncode != 0:
+                return {
+                    'repo': repo_name,
+                    'success': False,
+                    'error': f'Failed to push tag: {push_result.stderr}'
+                }
+            
+            log.info(f"[BULK-TAG] ✓ {repo_name} tagged successfully")
+            return {
+                'repo': repo_name,
+                'success': True,
+                'message': f'Successfully tagged {branch_name} with {tag_name}'
+            }
+        
+    except subprocess.TimeoutExpired:
+        return {
+            'repo': repo_name,
+            'success': False,
+            'error': 'Operation timed out'
+        }
+    except Exception as e:
+        return {
+            'repo': repo_name,
+            'success': False,
+            'error': str(e)
+        }
+
+async def _tag_repos(tag_one, repos, on_result):
+    """Tag all repos with at most _BULK_TAG_JOBS at once
+    
+    on_result is called with each result as soon as that repo is done.
+    """
+    # Every repo waits on its git processes, not on Python, so one event
+    # loop drives them all; the semaphore bounds how many run at a time
+    slots = asyncio.Semaphore(_BULK_TAG_JOBS)
+    
+    async def bounded(repo_info):
+        async with slots:
+            try:
+                return await tag_one(repo_info)
+            except Exception as e:
+                # Whatever goes wrong with one repo (even a malformed entry)
+                # is that repo's result, not the end of the stream
+                repo_name = repo_info.get('repo') if isinstance(repo_info, dict) else None
+                return {
+                    'repo': repo_name,
+                    'success': False,
+                    'error': str(e) or type(e).__name__
+                }
+    
+    for next_result in asyncio.as_completed([bounded(repo_info) for repo_info in repos]):
+        on_result(await next_result)
+
+# Fixed static pages of the viewer app: request path -> (file, content type)
+_STATIC_ROUTES = {
+    '/': ('viewer-app/public/index.html', 'text/html'),
+    '/index.html': ('viewer-app/public/index.html', 'text/html'),
+    '/styles.css': ('viewer-app/public/styles.css', 'text/css'),
+}
 
 class GitTagHandler(SimpleHTTPRequestHandler):
     """HTTP handler with CORS support and Git-based tag fetching"""
     
+    # Keep-alive: every response carries a Content-Length, and the
+    # threaded server means an idle connection doesn't hold up others
+    protocol_version = 'HTTP/1.1'
+    
     # Class-level variables for config caching
     _config_cache = None
+    _config_bytes_cache = None
     _config_mtime = 0
     _config_file = None
+    _config_last_check = 0.0
+    _auth_prefix = ''
+    _api_auth = None
+    _CONFIG_CHECK_INTERVAL = 2.0
+    
+    # Guards the shared caches below across request threads
+    _lock = threading.RLock()
+    
+    # ls-remote responses by (repo_url, 'tags' | 'heads'), kept briefly so
+    # repeated UI refreshes don't spawn git each time. Failures are kept
+    # for a shorter time so a broken repo is neither hammered nor stuck.
+    # Keys come from request parameters, so the cache is capped: past
+    # _REMOTE_CACHE_MAX entries, expired ones go first, then the oldest.
+    _remote_cache = {}
+    _REMOTE_TTL = 30
+    _REMOTE_ERROR_TTL = 5
+    _REMOTE_CACHE_MAX = 256
+    
+    # Tag and branch lists longer than this are streamed, this many
+    # entries per chunk
+    _STREAM_THRESHOLD = 500
+    _STREAM_BATCH = 256
     
     @classmethod
     def get_config(cls):
         """Get config with automatic reload on file change"""
-        config_file = 'config.json5' if os.path.exists('config.json5') else 'config.json'
+        # Request bursts (page load, polling) come far faster than config
+        # edits, so the file is only checked every couple of seconds
+        now = time.monotonic()
+        if cls._config_cache is not None and now - cls._config_last_check < cls._CONFIG_CHECK_INTERVAL:
+            return cls._config_cache
         
-        if not os.path.exists(config_file):
-            return None
-        
-        current_mtime = os.path.getmtime(config_file)
-        
-        # Check if we need to reload
-        if cls._config_cache is None or cls._config_file != config_file or current_mtime > cls._config_mtime:
-            print(f"[CONFIG] Loading/Reloading {config_file}...")
-            try:
-                with open(config_file, 'r') as f:
-                    content = f.read()
-                
-                if config_file.endswith('.json5'):
-                    cls._config_cache = cls.parse_json5(content)
-                else:
-                    cls._config_cache = json.loads(content)
-                
-                cls._config_mtime = current_mtime
-                cls._config_file = config_file
-                print(f"[CONFIG] ✓ Loaded successfully ({len(cls._config_cache.get('repositories', []))} repositories)")
-            except Exception as e:
-                print(f"[CONFIG] ✗ Error loading config: {e}")
+        # Requests are handled on several threads; one reload at a time
+        with cls._lock:
+            cls._config_last_check = now
+            config_file = 'config.json5' if os.path.exists('config.json5') else 'config.json'
+            
+            if not os.path.exists(config_file):
                 return None
-        
-        return cls._config_cache
+            
+            current_mtime = os.path.getmtime(config_file)
+            
+            # Check if we need to reload
+            if cls._config_cache is None or cls._config_file != config_file or current_mtime > cls._config_mtime:
+                log.info(f"[CONFIG] Loading/Reloading {config_file}...")
+                try:
+                    with open(config_file, 'r') as f:
+                        content = f.read()
+                    
+                    if config_file.endswith('.json5'):
+                        cls._config_cache = cls.parse_json5(content)
+                    else:
+                        cls._config_cache = json.loads(content)
+                    
+                    # Credentials are URL-encoded once per load, not per request
+                    cls._auth_prefix = _build_auth_prefix(
+                        cls._config_cache.get('gitUsername', ''),
+                        cls._config_cache.get('gitToken', '')
+                    )
+                    cls._api_auth = _build_api_auth(
+                        cls._config_cache.get('gitUsername', ''),
+                        cls._config_cache.get('gitToken', '')
+                    )
+                    # Serialized once per load so /api/config is a plain write
+                    cls._config_bytes_cache = json.dumps(cls._config_cache, separators=(',', ':')).encode()
+                    cls._config_mtime = current_mtime
+                    cls._config_file = config_file
+                    log.info(f"[CONFIG] ✓ Loaded successfully ({len(cls._config_cache.get('repositories', []))} repositories)")
+                except Exception as e:
+                    log.error(f"[CONFIG] ✗ Error loading config: {e}")
+                    return None
+            
+            return cls._config_cache
+    
+    @classmethod
+    def get_remote_cache(cls, key):
+        """Get a cached ls-remote response, or None if missing or expired"""
+        entry = cls._remote_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() < entry[0]:
+            return entry[1]
+        with cls._lock:
+            # Unless another thread has stored a fresh one meanwhile
+            if cls._remote_cache.get(key) is entry:
+                del cls._remote_cache[key]
+        return None
+    
+    @classmethod
+    def set_remote_cache(cls, key, response, ttl):
+        """Cache an ls-remote response for ttl seconds"""
+        now = time.monotonic()
+        with cls._lock:
+            cache = cls._remote_cache
+            # Re-inserted, so dict order stays oldest first
+            cache.pop(key, None)
+            if len(cache) >= cls._REMOTE_CACHE_MAX:
+                for old_key in [k for k, (expires, _) in cache.items() if expires <= now]:
+                    del cache[old_key]
+                while len(cache) >= cls._REMOTE_CACHE_MAX:
+                    del cache[next(iter(cache))]
+            cache[key] = (now + ttl, response)
+    
+    @classmethod
+    def drop_remote_tags(cls):
+        """Forget all cached tag lists"""
+        with cls._lock:
+            for key in [key for key in cls._remote_cache if key[1] == 'tags']:
+                del cls._remote_cache[key]
     
     @staticmethod
     def parse_json5(content):
         """Parse JSON5 content by converting it to valid JSON"""
-        result = []
-        in_string = False
-        escape_next = False
-        i = 0
-        
-        while i < len(content):
-            if escape_next:
-                result.append(content[i])
-                escape_next = False
-                i += 1
-                continue
-            
-            char = content[i]
-            
-            # Handle escape sequences
-            if char == '\\' and in_string:
-                result.append(char)
-                escape_next = True
-                i += 1
-                continue
-            
-            # Handle strings
-            if char == '"':
-                in_string = not in_string
-                result.append(char)
-                i += 1
-                continue
-            
-            # Skip comments when not in string
-            if not in_string:
-                # Single-line comments
-                if i < len(content) - 1 and content[i:i+2] == '//':
-                    # Skip until end of line
-                    while i < len(content) and content[i] != '\n':
-                        i += 1
-                    continue
-                
-                # Multi-line comments
-                if i < len(content) - 1 and content[i:i+2] == '/*':
-                    # Skip until */
-                    i += 2
-                    while i < len(content) - 1:
-                        if content[i:i+2] == '*/':
-                            i += 2
-                            break
-                        i += 1
-                    continue
-            
-            result.append(char)
-            i += 1
-        
-        content = ''.join(result)
+        # Remove comments in a single regex pass
+        content = _JSON5_STRIP.sub(_strip_json5_comment, content)
         
         # Now handle unquoted keys - find patterns like: word:
         # But only at the start of a line or after { or ,
-        lines = []
-        for line in content.split('\n'):
-            # Match unquoted keys: optional whitespace + word + optional whitespace + colon
-            line = re.sub(r'^(\s*)([a-zA-Z_]\w*)(\s*):', r'\1"\2"\3:', line)
-            line = re.sub(r'([{,]\s*)([a-zA-Z_]\w*)(\s*):', r'\1"\2"\3:', line)
-            lines.append(line)
-        
-        content = '\n'.join(lines)
+        content = _UNQUOTED_KEY.sub(r'\1"\2"\3:', content)
         
         # Remove trailing commas before } or ]
-        content = re.sub(r',(\s*[}\]])', r'\1', content)
+        content = _TRAILING_COMMA.sub(r'\1', content)
         
         return json.loads(content)
     
@@ -136,59 +696,173 @@ class GitTagHandler(SimpleHTTPRequestHandler):
                 self.send_error(404, 'config.json5 or config.json not found')
                 return
             
-            config_json = json.dumps(config)
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(config_json.encode())
-            print(f"[API] Served {self._config_file}")
+            self.send_json_bytes(self._config_bytes_cache)
+            log.info(f"[API] Served {self._config_file}")
             
         except Exception as e:
-            print(f"[API] Error serving config: {str(e)}")
+            log.error(f"[API] Error serving config: {str(e)}")
             self.send_error(500, f'Error reading config: {str(e)}')
     
+    def send_json(self, obj, status=200):
+        """Send obj as a compact JSON response"""
+        self.send_json_bytes(json.dumps(obj, separators=(',', ':')).encode(), status)
+    
+    def send_json_list(self, key, response):
+        """Send a {key: [...]} response, streaming long lists in chunks
+        
+        Repos with thousands of tags would otherwise be serialized to one
+        large string before the first byte goes out.
+        """
+        items = response[key]
+        if len(items) <= self._STREAM_THRESHOLD or self.request_version != 'HTTP/1.1':
+            self.send_json(response)
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        
+        self.write_chunk(b'{' + json.dumps(key).encode() + b':[')
+        for start in range(0, len(items), self._STREAM_BATCH):
+            batch = json.dumps(items[start:start + self._STREAM_BATCH], separators=(',', ':'))[1:-1]
+            self.write_chunk((batch if start == 0 else ',' + batch).encode())
+        self.write_chunk(b']}')
+        self.wfile.write(b'0\r\n\r\n')
+    
+    def start_ndjson(self):
+        """Start a newline-delimited JSON response, written by write_ndjson
+        
+        The response starts before the first item exists, so a client sees
+        each result as soon as it is ready instead of after the last one.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self._ndjson_chunked = self.request_version == 'HTTP/1.1'
+        if self._ndjson_chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            # No chunked encoding before HTTP/1.1: the body ends at close
+            self.close_connection = True
+        self.end_headers()
+    
+    def write_ndjson(self, item):
+        """Send one item of a response begun with start_ndjson"""
+        line = json.dumps(item, separators=(',', ':')).encode() + b'\n'
+        if self._ndjson_chunked:
+            self.write_chunk(line)
+        else:
+            self.wfile.write(line)
+        self.wfile.flush()
+    
+    def end_ndjson(self):
+        """Finish a response begun with start_ndjson"""
+        if self._ndjson_chunked:
+            self.wfile.write(b'0\r\n\r\n')
+    
+    def write_chunk(self, data):
+        """Write one chunk of a chunked transfer-encoded body"""
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+    
+    def send_json_bytes(self, body, status=200):
+        """Send an already encoded JSON body in a single write"""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', len(body))
+        self.end_headers()
+        self.wfile.write(body)
+    
     def do_GET(self):
         """Handle GET requests - serve API endpoints or static files"""
+        path = self.path
         
-        if self.path == '/api/config':
-            self.serve_config()
-        elif self.path.startswith('/api/tags'):
-            self.fetch_repo_tags()
-        elif self.path.startswith('/api/branches'):
-            self.fetch_repo_branches()
-        elif self.path.startswith('/api/commits'):
-            self.fetch_repo_commits()
-        elif self.path == '/' or self.path == '/index.html':
-            # Serve the new modular index.html
-            self.serve_file('viewer-app/public/index.html', 'text/html')
-        elif self.path.startswith('/styles.css'):
-            self.serve_file('viewer-app/public/styles.css', 'text/css')
-        elif self.path.startswith('/js/'):
-            # Serve JavaScript files from viewer-app/public/js/
-            js_file = 'viewer-app/public' + self.path
-            self.serve_file(js_file, 'application/javascript')
+        if path.startswith('/api/'):
+            if path == '/api/config':
+                return self.serve_config()
+            if path.startswith('/api/tags'):
+                return self.fetch_repo_tags()
+            if path.startswith('/api/branches'):
+                return self.fetch_repo_branches()
+            if path.startswith('/api/commits'):
+                return self.fetch_repo_commits()
         else:
-            # Serve static files (HTML, JS, CSS, JSON)
-            super().do_GET()
+            route = _STATIC_ROUTES.get(path.split('?', 1)[0])
+            if route:
+                return self.serve_file(*route)
+            if path.startswith('/js/'):
+                # Serve JavaScript files from viewer-app/public/js/
+                return self.serve_file('viewer-app/public' + path, 'application/javascript')
+        
+        # Serve static files (HTML, JS, CSS, JSON)
+        super().do_GET()
     
     def serve_file(self, filepath, content_type):
         """Serve a static file"""
         try:
-            with open(filepath, 'rb') as f:
-                content = f.read()
-
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', len(content))
-            self.end_headers()
-            self.wfile.write(content)
+            # Unbuffered: the body is sent straight from the file descriptor
+            with open(filepath, 'rb', buffering=0) as f:
+                st = os.fstat(f.fileno())
+                size = st.st_size
+                etag = f'W/"{st.st_mtime_ns:x}-{size:x}"'
+                
+                if self.is_not_modified(etag, st.st_mtime):
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', size)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', formatdate(st.st_mtime, usegmt=True))
+                self.send_header('Cache-Control', 'public, max-age=300')
+                self.end_headers()
+                self.send_file_body(f, size)
         except FileNotFoundError:
             self.send_error(404, f'File not found: {filepath}')
         except Exception as e:
-            print(f"[ERROR] Error serving file {filepath}: {e}")
+            log.error(f"[ERROR] Error serving file {filepath}: {e}")
             self.send_error(500, f'Error serving file: {str(e)}')
 
+    def is_not_modified(self, etag, mtime):
+        """Check the request's conditional headers against a file's ETag and mtime"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since
+            return if_none_match.strip() == '*' or etag in [t.strip() for t in if_none_match.split(',')]
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                return False
+            # Last-Modified has one-second resolution
+            return int(mtime) <= since.timestamp()
+        
+        return False
+    
+    def send_file_body(self, f, size):
+        """Send an open file as the response body, in the kernel where possible"""
+        self.wfile.flush()
+        out_fd = self.connection.fileno()
+        in_fd = f.fileno()
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile on this platform (or for this file)
+            if offset:
+                raise
+            shutil.copyfileobj(f, self.wfile, length=1 << 20)
+
     def do_POST(self):
         """Handle POST requests for bulk operations"""
         if self.path == '/api/bulk-tag':
@@ -196,34 +870,6 @@ class GitTagHandler(SimpleHTTPRequestHandler):
         else:
             self.send_error(404, 'Endpoint not found')
     
-    def serve_config(self):
-        """Serve the config.json5 file"""
-        try:
-            # Try JSON5 first, fallback to JSON
-            config_file = 'config.json5' if os.path.exists('config.json5') else 'config.json'
-            
-            with open(config_file, 'r') as f:
-                content = f.read()
-            
-            # Parse JSON5 and convert to JSON for response
-            if config_file.endswith('.json5'):
-                config_data = self.parse_json5(content)
-                config_json = json.dumps(config_data)
-            else:
-                config_json = content
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(config_json.encode())
-            print(f"[API] Served {config_file}")
-            
-        except FileNotFoundError:
-            self.send_error(404, 'config.json5 or config.json not found')
-        except Exception as e:
-            print(f"[API] Error serving config: {str(e)}")
-            self.send_error(500, f'Error reading config: {str(e)}')
-    
     def fetch_repo_branches(self):
         """Fetch branches for a repository using Git"""
         try:
@@ -246,114 +892,69 @@ class GitTagHandler(SimpleHTTPRequestHandler):
             
             org = config.get('organization', '')
             default_base_url = config.get('baseUrl', 'https://dev.azure.com')
-            git_username = config.get('gitUsername', '')
-            git_token = config.get('gitToken', '')
+            auth_part = self._auth_prefix
             
             # Get repository-specific baseUrl if provided
             base_url = query_params.get('baseUrl', [default_base_url])[0]
             
-            # Check if baseUrl is a full Git URL
-            if '.git' in base_url or 'github.com' in base_url or 'gitlab.com' in base_url:
-                # Full Git URL - use directly
-                base_url_clean = base_url.replace('https://', '').replace('http://', '')
-                auth_part = ''
-                if git_token:
-                    if git_username:
-                        auth_part = f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
-                    else:
-                        auth_part = f"{quote(git_token, safe='')}@"
-                elif git_username:
-                    auth_part = f"{quote(git_username, safe='')}@"
-                
-                repo_url = f"https://{auth_part}{base_url_clean}" if auth_part else base_url
-            else:
-                # Azure DevOps URL - construct from parts
-                base_url_clean = base_url.replace('https://', '').replace('http://', '')
-                
-                # Prepare authentication part of URL (URL-encode credentials)
-                auth_part = ''
-                if git_token:
-                    if git_username:
-                        auth_part = f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
-                    else:
-                        auth_part = f"{quote(git_token, safe='')}@"
-                elif git_username:
-                    auth_part = f"{quote(git_username, safe='')}@"
-                
-                if 'visualstudio.com' in base_url_clean:
-                    # Format: https://{org}.visualstudio.com/{project}/_git/{repo}
-                    if auth_part:
-                        repo_url = f"https://{auth_part}{base_url_clean}/{project_name}/_git/{repo_name}"
-                    else:
-                        repo_url = f"https://{base_url_clean}/{project_name}/_git/{repo_name}"
-                else:
-                    # Format: https://dev.azure.com/{org}/{project}/_git/{repo}
-                    if not org:
-                        print(f"[GIT] Error: organization required for dev.azure.com")
-                        self.send_error(400, 'organization required for dev.azure.com URLs')
-                        return
-                    
-                    if auth_part:
-                        repo_url = f"https://{auth_part}{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
-                    else:
-                        repo_url = f"https://{org}@{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
+            try:
+                repo_url = _build_repo_url(base_url, project_name, repo_name, org, auth_part)
+            except ValueError as e:
+                log.error(f"[GIT] Error: {e} (baseUrl={base_url!r}, project={project_name!r}, repo={repo_name!r})")
+                self.send_error(400, str(e))
+                return
             
-            print(f"[GIT] Fetching branches for: {repo_name}")
-            print(f"[GIT] URL: {repo_url}")
+            cache_key = (repo_url, 'heads')
+            cached = self.get_remote_cache(cache_key)
+            if cached is not None:
+                log.info(f"[GIT] Using cached branches for: {repo_name}")
+                self.send_json_list('branches', cached)
+                return
             
-            # Create temporary directory
-            temp_dir = tempfile.mkdtemp(prefix='git-branches-')
+            log.info(f"[GIT] Fetching branches for: {repo_name}")
+            log.info(f"[GIT] URL: {repo_url}")
             
-            try:
-                # Use git ls-remote to fetch branches without cloning
-                result = subprocess.run(
-                    ['git', 'ls-remote', '--heads', '--refs', repo_url],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    cwd=temp_dir
-                )
-                
-                if result.returncode != 0:
-                    print(f"[GIT] Error: {result.stderr}")
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({'branches': [], 'error': result.stderr}).encode())
-                    return
-                
-                # Parse branches from output
-                branches = []
-                for line in result.stdout.strip().split('\n'):
-                    if line and 'refs/heads/' in line:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            commit_hash = parts[0]
-                            branch_name = parts[1].split('refs/heads/')[1].strip()
-                            branches.append({
-                                'name': branch_name,
-                                'commit': commit_hash,
-                                'shortCommit': commit_hash[:7]
-                            })
-                
-                print(f"[GIT] Found {len(branches)} branches for {repo_name}")
-                
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({'branches': branches}).encode())
-                
-            finally:
-                # Clean up temp directory
-                shutil.rmtree(temp_dir, ignore_errors=True)
+            # Use git ls-remote to fetch branches without cloning
+            result = _run_git_sync(['git', 'ls-remote', '--heads', '--refs', '--', repo_url], timeout=30)
+            
+            if result.returncode != 0:
+                error = result.stderr.decode('utf-8', 'replace')
+                log.error(f"[GIT] Error: {error}")
+                response = {'branches': [], 'error': error}
+                self.set_remote_cache(cache_key, response, self._REMOTE_ERROR_TTL)
+                self.send_json(response)
+                return
+            
+            # Parse branches from output
+            branches = []
+            # Output is parsed as bytes; only the fields that go into the
+            # response are decoded
+            for line in result.stdout.split(b'\n'):
+                if b'refs/heads/' in line:
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        commit_hash = parts[0].decode('ascii')
+                        branch_name = parts[1].split(b'refs/heads/')[1].decode('utf-8', 'replace')
+                        branches.append({
+                            'name': branch_name,
+                            'commit': commit_hash,
+                            'shortCommit': commit_hash[:7]
+                        })
+            
+            log.info(f"[GIT] Found {len(branches)} branches for {repo_name}")
+            
+            # Send response
+            response = {'branches': branches}
+            self.set_remote_cache(cache_key, response, self._REMOTE_TTL)
+            self.send_json_list('branches', response)
                 
         except subprocess.TimeoutExpired:
-            print(f"[GIT] Timeout fetching branches for {repo_name}")
+            log.warning(f"[GIT] Timeout fetching branches for {repo_name}")
             self.send_error(504, 'Git operation timed out')
         except Exception as e:
-            print(f"[GIT] Error: {str(e)}")
-            self.send_error(500, f'Internal Server Error: {str(e)}')
+            # Logged only: the message may quote the request
+            log.error(f"[GIT] Error: {e!r}")
+            self.send_error(500, 'Internal Server Error')
     
     def fetch_repo_commits(self):
         """Fetch recent commits for a repository using Git"""
@@ -371,6 +972,13 @@ class GitTagHandler(SimpleHTTPRequestHandler):
             branch = query_params.get('branch', ['dev'])[0]  # Default to 'dev' branch
             limit = int(query_params.get('limit', ['10'])[0])  # Default to 10 commits
             
+            try:
+                _check_branch_name(branch)
+            except ValueError as e:
+                log.error(f"[GIT] Error: {e} ({branch!r})")
+                self.send_error(400, str(e))
+                return
+            
             # Load config
             config = self.get_config()
             if config is None:
@@ -379,143 +987,81 @@ class GitTagHandler(SimpleHTTPRequestHandler):
             
             org = config.get('organization', '')
             default_base_url = config.get('baseUrl', 'https://dev.azure.com')
-            git_username = config.get('gitUsername', '')
-            git_token = config.get('gitToken', '')
+            auth_part = self._auth_prefix
             
             # Get repository-specific baseUrl if provided
             base_url = query_params.get('baseUrl', [default_base_url])[0]
             
-            # Check if baseUrl is a full Git URL
-            if '.git' in base_url or 'github.com' in base_url or 'gitlab.com' in base_url:
-                # Full Git URL - use directly
-                base_url_clean = base_url.replace('https://', '').replace('http://', '')
-                auth_part = ''
-                if git_token:
-                    if git_username:
-                        auth_part = f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
-                    else:
-                        auth_part = f"{quote(git_token, safe='')}@"
-                elif git_username:
-                    auth_part = f"{quote(git_username, safe='')}@"
-                
-                repo_url = f"https://{auth_part}{base_url_clean}" if auth_part else base_url
-            else:
-                # Azure DevOps URL - construct from parts
-                base_url_clean = base_url.replace('https://', '').replace('http://', '')
-                
-                auth_part = ''
-                if git_token:
-                    if git_username:
-                        auth_part = f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
-                    else:
-                        auth_part = f"{quote(git_token, safe='')}@"
-                elif git_username:
-                    auth_part = f"{quote(git_username, safe='')}@"
-                
-                if 'visualstudio.com' in base_url_clean:
-                    if auth_part:
-                        repo_url = f"https://{auth_part}{base_url_clean}/{project_name}/_git/{repo_name}"
-                    else:
-                        repo_url = f"https://{base_url_clean}/{project_name}/_git/{repo_name}"
-                else:
-                    if not org:
-                        self.send_error(400, 'organization required for dev.azure.com URLs')
-                        return
-                    if auth_part:
-                        repo_url = f"https://{auth_part}{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
-                    else:
-                        repo_url = f"https://{org}@{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
-            
-            print(f"[GIT] Fetching commits for: {repo_name} (branch: {branch}, limit: {limit})")
-            print(f"[GIT] URL: {repo_url}")
+            try:
+                repo_url = _build_repo_url(base_url, project_name, repo_name, org, auth_part)
+            except ValueError as e:
+                log.error(f"[GIT] Error: {e} (baseUrl={base_url!r}, project={project_name!r}, repo={repo_name!r})")
+                self.send_error(400, str(e))
+                return
             
-            # Create temporary directory
-            temp_dir = tempfile.mkdtemp(prefix='git-commits-')
+            log.info(f"[GIT] Fetching commits for: {repo_name} (branch: {branch}, limit: {limit})")
+            log.info(f"[GIT] URL: {repo_url}")
             
-            try:
-                # Clone the repository (shallow clone of the specific branch)
-                clone_result = subprocess.run(
-                    ['git', 'clone', '--depth', str(limit), '--single-branch', '--branch', branch, repo_url],
-                    capture_output=True,
-                    text=True,
+            with _scratch_dir('git-commits-') as temp_dir:
+                # Fetch just the branch history into a bare repository; no
+                # working tree is checked out and, as the log only reads
+                # commits, no blobs are fetched (nor tags, nor the automatic
+                # maintenance run afterwards)
+                _run_git_sync(['git', 'init', '--bare', '-q', temp_dir], timeout=10).check_returncode()
+                fetch_result = _run_git_sync(
+                    ['git', '-c', 'maintenance.auto=false', 'fetch', '-q', '--no-tags', '--depth', str(limit),
+                     '--filter=blob:none', '--', repo_url, branch],
                     timeout=60,
-                    cwd=temp_dir
+                    cwd=temp_dir,
+                    text=True
                 )
                 
-                if clone_result.returncode != 0:
-                    print(f"[GIT] Error: {clone_result.stderr}")
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({'commits': [], 'error': clone_result.stderr}).encode())
+                if fetch_result.returncode != 0:
+                    log.error(f"[GIT] Error: {fetch_result.stderr}")
+                    self.send_json({'commits': [], 'error': fetch_result.stderr})
                     return
                 
-                repo_dir = os.path.join(temp_dir, repo_name)
-                
                 # Get commit log with format
-                log_result = subprocess.run(
-                    ['git', 'log', f'-{limit}', '--pretty=format:%H%n%h%n%an%n%ae%n%at%n%s%n%b%n---COMMIT-END---'],
-                    capture_output=True,
-                    text=True,
+                log_result = _run_git_sync(
+                    ['git', 'log', f'-{limit}', '--pretty=format:%H%n%h%n%an%n%ae%n%at%n%s%n%b%n---COMMIT-END---', 'FETCH_HEAD'],
                     timeout=10,
-                    cwd=repo_dir
+                    cwd=temp_dir
                 )
                 
                 if log_result.returncode != 0:
-                    print(f"[GIT] Error fetching log: {log_result.stderr}")
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({'commits': [], 'branch': branch, 'error': log_result.stderr}).encode())
+                    error = log_result.stderr.decode('utf-8', 'replace')
+                    log.error(f"[GIT] Error fetching log: {error}")
+                    self.send_json({'commits': [], 'branch': branch, 'error': error})
                     return
                 
-                # Parse commits
+                # Parse commits from the raw log bytes, decoding only the
+                # text fields that go into the response
                 commits = []
-                commit_texts = log_result.stdout.split('---COMMIT-END---')
-                
-                for commit_text in commit_texts:
-                    if not commit_text.strip():
-                        continue
-                    
-                    lines = commit_text.strip().split('\n')
-                    if len(lines) >= 6:
-                        full_hash = lines[0]
-                        short_hash = lines[1]
-                        author_name = lines[2]
-                        author_email = lines[3]
-                        timestamp = lines[4]
-                        subject = lines[5]
-                        body = '\n'.join(lines[6:]).strip() if len(lines) > 6 else ''
-                        
-                        commits.append({
-                            'hash': full_hash,
-                            'shortHash': short_hash,
-                            'author': author_name,
-                            'email': author_email,
-                            'timestamp': int(timestamp),
-                            'date': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(int(timestamp))),
-                            'subject': subject,
-                            'body': body
-                        })
+                for match in _LOG_RE.finditer(log_result.stdout):
+                    full_hash, short_hash, author_name, author_email, timestamp, subject, body = match.groups()
+                    commits.append({
+                        'hash': full_hash.decode('ascii'),
+                        'shortHash': short_hash.decode('ascii'),
+                        'author': author_name.decode('utf-8', 'replace'),
+                        'email': author_email.decode('utf-8', 'replace'),
+                        'timestamp': int(timestamp),
+                        'subject': subject.decode('utf-8', 'replace'),
+                        'body': body.strip().decode('utf-8', 'replace')
+                    })
                 
-                print(f"[GIT] Found {len(commits)} commits for {repo_name}")
+                log.info(f"[GIT] Found {len(commits)} commits for {repo_name}")
                 
                 # Send response
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({'commits': commits, 'branch': branch}).encode())
+                self.send_json({'commits': commits, 'branch': branch})
                 
-            finally:
-                # Clean up temp directory
-                shutil.rmtree(temp_dir, ignore_errors=True)
                 
         except subprocess.TimeoutExpired:
-            print(f"[GIT] Timeout fetching commits for {repo_name}")
+            log.warning(f"[GIT] Timeout fetching commits for {repo_name}")
             self.send_error(504, 'Git operation timed out')
         except Exception as e:
-            print(f"[GIT] Error: {str(e)}")
-            self.send_error(500, f'Internal Server Error: {str(e)}')
+            # Logged only: the message may quote the request
+            log.error(f"[GIT] Error: {e!r}")
+            self.send_error(500, 'Internal Server Error')
     
     def fetch_repo_tags(self):
         """Fetch tags for a repository using Git"""
@@ -531,125 +1077,77 @@ class GitTagHandler(SimpleHTTPRequestHandler):
             repo_name = query_params['repo'][0]
             project_name = query_params.get('project', [repo_name])[0]  # Default to repo name if not provided
             
-            # Load config to get organization and base URL
-            try:
-                config_file = 'config.json5' if os.path.exists('config.json5') else 'config.json'
-                with open(config_file, 'r') as f:
-                    content = f.read()
-                
-                if config_file.endswith('.json5'):
-                    config = self.parse_json5(content)
-                else:
-                    config = json.loads(content)
-            except Exception as e:
-                self.send_error(500, f'Error loading config: {str(e)}')
+            # Load config
+            config = self.get_config()
+            if config is None:
+                self.send_error(500, 'Failed to load config')
                 return
             
             org = config.get('organization', '')
             default_base_url = config.get('baseUrl', 'https://dev.azure.com')
-            git_username = config.get('gitUsername', '')
-            git_token = config.get('gitToken', '')
+            auth_part = self._auth_prefix
             
             # Get repository-specific baseUrl if provided
             base_url = query_params.get('baseUrl', [default_base_url])[0]
             
-            # Check if baseUrl is a full Git URL
-            if '.git' in base_url or 'github.com' in base_url or 'gitlab.com' in base_url:
-                # Full Git URL - use directly
-                base_url_clean = base_url.replace('https://', '').replace('http://', '')
-                auth_part = ''
-                if git_token:
-                    if git_username:
-                        auth_part = f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
-                    else:
-                        auth_part = f"{quote(git_token, safe='')}@"
-                elif git_username:
-                    auth_part = f"{quote(git_username, safe='')}@"
-                
-                repo_url = f"https://{auth_part}{base_url_clean}" if auth_part else base_url
-            else:
-                # Azure DevOps URL - construct from parts
-                base_url_clean = base_url.replace('https://', '').replace('http://', '')
-                
-                auth_part = ''
-                if git_token:
-                    if git_username:
-                        auth_part = f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
-                    else:
-                        auth_part = f"{quote(git_token, safe='')}@"
-                elif git_username:
-                    auth_part = f"{quote(git_username, safe='')}@"
-                
-                if 'visualstudio.com' in base_url_clean:
-                    if auth_part:
-                        repo_url = f"https://{auth_part}{base_url_clean}/{project_name}/_git/{repo_name}"
-                    else:
-                        repo_url = f"https://{base_url_clean}/{project_name}/_git/{repo_name}"
-                else:
-                    if not org:
-                        self.send_error(400, 'organization required for dev.azure.com URLs')
-                        return
-                    if auth_part:
-                        repo_url = f"https://{auth_part}{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
-                    else:
-                        repo_url = f"https://{org}@{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
+            try:
+                repo_url = _build_repo_url(base_url, project_name, repo_name, org, auth_part)
+            except ValueError as e:
+                log.error(f"[GIT] Error: {e} (baseUrl={base_url!r}, project={project_name!r}, repo={repo_name!r})")
+                self.send_error(400, str(e))
+                return
             
-            print(f"[GIT] Fetching tags for: {repo_name}")
-            print(f"[GIT] URL: {repo_url}")
+            cache_key = (repo_url, 'tags')
+            cached = self.get_remote_cache(cache_key)
+            if cached is not None:
+                log.info(f"[GIT] Using cached tags for: {repo_name}")
+                self.send_json_list('tags', cached)
+                return
             
-            # Create temporary directory
-            temp_dir = tempfile.mkdtemp(prefix='git-tags-')
+            log.info(f"[GIT] Fetching tags for: {repo_name}")
+            log.info(f"[GIT] URL: {repo_url}")
             
-            try:
-                # Use git ls-remote to fetch tags without cloning
-                result = subprocess.run(
-                    ['git', 'ls-remote', '--tags', '--refs', repo_url],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    cwd=temp_dir
-                )
-                
-                if result.returncode != 0:
-                    print(f"[GIT] Error: {result.stderr}")
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({'tags': [], 'error': result.stderr}).encode())
-                    return
-                
-                # Parse tags from output with commit hashes
-                tags = []
-                for line in result.stdout.strip().split('\n'):
-                    if line and 'refs/tags/' in line:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            commit_hash = parts[0]
-                            tag_name = parts[1].split('refs/tags/')[1].strip()
-                            tags.append({
-                                'name': tag_name,
-                                'commit': commit_hash,
-                                'shortCommit': commit_hash[:7]
-                            })
-                
-                print(f"[GIT] Found {len(tags)} tags for {repo_name}")
-                
-                # Send response (sorting will be done on frontend)
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({'tags': tags}).encode())
-                
-            finally:
-                # Clean up temp directory
-                shutil.rmtree(temp_dir, ignore_errors=True)
+            # Use git ls-remote to fetch tags without cloning
+            result = _run_git_sync(['git', 'ls-remote', '--tags', '--refs', '--', repo_url], timeout=30)
+            
+            if result.returncode != 0:
+                error = result.stderr.decode('utf-8', 'replace')
+                log.error(f"[GIT] Error: {error}")
+                response = {'tags': [], 'error': error}
+                self.set_remote_cache(cache_key, response, self._REMOTE_ERROR_TTL)
+                self.send_json(response)
+                return
+            
+            # Parse tags from output with commit hashes
+            tags = []
+            # Output is parsed as bytes; only the fields that go into the
+            # response are decoded
+            for line in result.stdout.split(b'\n'):
+                if b'refs/tags/' in line:
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        commit_hash = parts[0].decode('ascii')
+                        tag_name = parts[1].split(b'refs/tags/')[1].decode('utf-8', 'replace')
+                        tags.append({
+                            'name': tag_name,
+                            'commit': commit_hash,
+                            'shortCommit': commit_hash[:7]
+                        })
+            
+            log.info(f"[GIT] Found {len(tags)} tags for {repo_name}")
+            
+            # Send response (sorting will be done on frontend)
+            response = {'tags': tags}
+            self.set_remote_cache(cache_key, response, self._REMOTE_TTL)
+            self.send_json_list('tags', response)
                 
         except subprocess.TimeoutExpired:
-            print(f"[GIT] Timeout fetching tags for {repo_name}")
+            log.warning(f"[GIT] Timeout fetching tags for {repo_name}")
             self.send_error(504, 'Git operation timed out')
         except Exception as e:
-            print(f"[GIT] Error: {str(e)}")
-            self.send_error(500, f'Internal Server Error: {str(e)}')
+            # Logged only: the message may quote the request
+            log.error(f"[GIT] Error: {e!r}")
+            self.send_error(500, 'Internal Server Error')
     
     def bulk_tag_repos(self):
         """Create tags for multiple repositories based on a branch"""
@@ -666,6 +1164,13 @@ class GitTagHandler(SimpleHTTPRequestHandler):
             if not branch_name or not tag_name or not repos:
                 self.send_error(400, 'Missing required parameters: branch, tag, repos')
                 return
+            try:
+                _check_branch_name(branch_name)
+                _check_tag_name(tag_name)
+            except ValueError as e:
+                log.error(f"[BULK-TAG] Error: {e} (branch={branch_name!r}, tag={tag_name!r})")
+                self.send_error(400, str(e))
+                return
             
             # Load config
             config = self.get_config()
@@ -675,167 +1180,80 @@ class GitTagHandler(SimpleHTTPRequestHandler):
             
             org = config.get('organization', '')
             default_base_url = config.get('baseUrl', 'https://dev.azure.com')
-            git_username = config.get('gitUsername', '')
-            git_token = config.get('gitToken', '')
+            auth_part = self._auth_prefix
             
-            results = []
-            
-            for repo_info in repos:
-                repo_name = repo_info['repo']
-                project_name = repo_info.get('project', repo_name)  # Default to repo name if not provided
-                base_url = repo_info.get('baseUrl', default_base_url)
-                
-                print(f"[BULK-TAG] Processing {repo_name}...")
-                
-                # Check if baseUrl is a full Git URL
-                if '.git' in base_url or 'github.com' in base_url or 'gitlab.com' in base_url:
-                    # Full Git URL - use directly
-                    base_url_clean = base_url.replace('https://', '').replace('http://', '')
-                    auth_part = ''
-                    if git_token:
-                        if git_username:
-                            auth_part = f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
-                        else:
-                            auth_part = f"{quote(git_token, safe='')}@"
-                    elif git_username:
-                        auth_part = f"{quote(git_username, safe='')}@"
-                    
-                    repo_url = f"https://{auth_part}{base_url_clean}" if auth_part else base_url
+            # Everything but the repo itself is fixed for the whole request
+            # and bound once up front
+            tag_one = functools.partial(
+                _tag_one_repo,
+                branch_name=branch_name,
+                tag_name=tag_name,
+                org=org,
+                default_base_url=default_base_url,
+                auth_part=auth_part,
+                push_refspec=f'+FETCH_HEAD:refs/tags/{tag_name}',
+                api_auth=self._api_auth
+            )
+            # A client that goes away mid-stream must not cancel the rest:
+            # that would kill git mid-push and leave the tagging half done.
+            # Finish every repo and log what the client never got instead.
+            unreported = []
+
+            def on_result(result):
+                if not unreported:
+                    try:
+                        self.write_ndjson(result)
+                        return
+                    except OSError as e:
+                        log.warning(f"[BULK-TAG] Client went away ({e}); finishing the remaining repos")
+                unreported.append(result)
+
+            self.start_ndjson()
+            try:
+                asyncio.run(_tag_repos(tag_one, repos, on_result))
+                if unreported:
+                    self.close_connection = True
+                    for result in unreported:
+                        outcome = 'tagged' if result['success'] else f"not tagged: {result.get('error')}"
+                        log.warning(f"[BULK-TAG] Unreported {result['repo']}: {outcome}")
                 else:
-                    # Azure DevOps URL - construct from parts
-                    base_url_clean = base_url.replace('https://', '').replace('http://', '')
-                    
-                    auth_part = ''
-                    if git_token:
-                        if git_username:
-                            auth_part = f"{quote(git_username, safe='')}:{quote(git_token, safe='')}@"
-                        else:
-                            auth_part = f"{quote(git_token, safe='')}@"
-                    elif git_username:
-                        auth_part = f"{quote(git_username, safe='')}@"
-                    
-                    if 'visualstudio.com' in base_url_clean:
-                        if auth_part:
-                            repo_url = f"https://{auth_part}{base_url_clean}/{project_name}/_git/{repo_name}"
-                        else:
-                            repo_url = f"https://{base_url_clean}/{project_name}/_git/{repo_name}"
-                    else:
-                        if not org:
-                            results.append({
-                                'repo': repo_name,
-                                'success': False,
-                                'error': 'organization required for dev.azure.com URLs'
-                            })
-                            continue
-                        if auth_part:
-                            repo_url = f"https://{auth_part}{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
-                        else:
-                            repo_url = f"https://{org}@{base_url_clean}/{org}/{project_name}/_git/{repo_name}"
-                
-                # Create temporary directory
-                temp_dir = tempfile.mkdtemp(prefix=f'git-tag-{repo_name}-')
-                
-                try:
-                    # Clone the specific branch
-                    clone_result = subprocess.run(
-                        ['git', 'clone', '--depth', '1', '--single-branch', '--branch', branch_name, repo_url],
-                        capture_output=True,
-                        text=True,
-                        timeout=60,
-                        cwd=temp_dir
-                    )
-                    
-                    if clone_result.returncode != 0:
-                        results.append({
-                            'repo': repo_name,
-                            'success': False,
-                            'error': f'Failed to clone branch {branch_name}: {clone_result.stderr}'
-                        })
-                        continue
-                    
-                    repo_dir = os.path.join(temp_dir, repo_name)
-                    
-                    # Delete existing tag locally
-                    subprocess.run(['git', 'tag', '-d', tag_name], cwd=repo_dir, capture_output=True)
-                    
-                    # Delete existing tag remotely
-                    subprocess.run(['git', 'push', '--delete', 'origin', tag_name], cwd=repo_dir, capture_output=True)
-                    
-                    # Create new tag
-                    tag_result = subprocess.run(
-                        ['git', 'tag', tag_name, 'HEAD'],
-                        capture_output=True,
-                        text=True,
-                        cwd=repo_dir
-                    )
-                    
-                    if tag_result.returncode != 0:
-                        results.append({
-                            'repo': repo_name,
-                            'success': False,
-                            'error': f'Failed to create tag: {tag_result.stderr}'
-                        })
-                        continue
-                    
-                    # Push tag
-                    push_result = subprocess.run(
-                        ['git', 'push', 'origin', tag_name],
-                        capture_output=True,
-                        text=True,
-                        timeout=30,
-                        cwd=repo_dir
-                    )
-                    
-                    if push_result.returncode != 0:
-                        results.append({
-                            'repo': repo_name,
-                            'success': False,
-                            'error': f'Failed to push tag: {push_result.stderr}'
-                        })
-                        continue
-                    
-                    results.append({
-                        'repo': repo_name,
-                        'success': True,
-                        'message': f'Successfully tagged {branch_name} with {tag_name}'
-                    })
-                    print(f"[BULK-TAG] ✓ {repo_name} tagged successfully")
-                    
-                except subprocess.TimeoutExpired:
-                    results.append({
-                        'repo': repo_name,
-                        'success': False,
-                        'error': 'Operation timed out'
-                    })
-                except Exception as e:
-                    results.append({
-                        'repo': repo_name,
-                        'success': False,
-                        'error': str(e)
-                    })
-                finally:
-                    # Clean up temp directory
-                    shutil.rmtree(temp_dir, ignore_errors=True)
-            
-            # Send response
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({'results': results}).encode())
+                    self.end_ndjson()
+            except Exception as e:
+                # Too late for an error status; cut the stream short instead
+                log.error(f"[BULK-TAG] Error: {str(e)}")
+                self.close_connection = True
+            finally:
+                # Remote tags may have changed, even where tagging failed
+                # or the client went away mid-stream
+                self.drop_remote_tags()
             
         except Exception as e:
-            print(f"[BULK-TAG] Error: {str(e)}")
-            self.send_error(500, f'Internal Server Error: {str(e)}')
+            # Logged only: the message may quote the request
+            log.error(f"[BULK-TAG] Error: {e!r}")
+            self.send_error(500, 'Internal Server Error')
     
     def log_message(self, format, *args):
         """Custom logging format"""
-        print(f"[{self.log_date_time_string()}] {format % args}")
+        log.info(f"[{self.log_date_time_string()}] {format}", *args)
+
+
+class GitTagServer(ThreadingHTTPServer):
+    """Threaded server: a long bulk-tag request doesn't hold up others"""
+    # Don't make Ctrl+C wait on in-flight requests
+    daemon_threads = True
+    allow_reuse_address = True
+    # The viewer opens a request per repository at once; the default
+    # listen backlog of 5 makes the kernel refuse or retry the rest
+    request_queue_size = 128
 
 
 def run_server(port=8000):
     """Start the HTTP server"""
     server_address = ('', port)
-    httpd = HTTPServer(server_address, GitTagHandler)
+    httpd = GitTagServer(server_address, GitTagHandler)
+    # Exit normally on SIGTERM too, so atexit still removes the scratch
+    # directory (which may be taking up memory on tmpfs)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     
     print("=" * 60)
     print("🚀 Git Tag Viewer Server")
@@ -851,6 +1269,7 @@ def run_server(port=8000):
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
+        httpd.server_close()
         print("\n\n👋 Server stopped")
         sys.exit(0)
 
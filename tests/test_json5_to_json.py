@@ -0,0 +1,89 @@
+"""Tests for the JSON5 to JSON converter"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json5_to_json
+from json5_to_json import convert_json5_to_json
+
+
+class ConvertJson5Test(unittest.TestCase):
+    def assertConvertsTo(self, json5, expected):
+        self.assertEqual(json.loads(convert_json5_to_json(json5)), expected)
+
+    def test_comments_trailing_commas_and_unquoted_keys(self):
+        self.assertConvertsTo(
+            '{\n  // line\n  a: 1, /* block */\n  b: [1, 2,],\n}',
+            {'a': 1, 'b': [1, 2]}
+        )
+
+    def test_comment_markers_inside_strings_are_kept(self):
+        self.assertConvertsTo(
+            '{\n  url: "https://host/path", s: "a /* b */ c",\n}',
+            {'url': 'https://host/path', 's': 'a /* b */ c'}
+        )
+
+    def test_key_after_comment(self):
+        self.assertConvertsTo(
+            '{\n /* c */ a: 1,\n b: [1,2,],\n}',
+            {'a': 1, 'b': [1, 2]}
+        )
+        self.assertConvertsTo('{ /* c */ a: 1, // d\n b: 2}', {'a': 1, 'b': 2})
+
+    def test_comment_between_key_and_colon(self):
+        self.assertConvertsTo('{\n  a /* c */ : 1,\n  b // d\n  : 2\n}', {'a': 1, 'b': 2})
+
+    def test_plain_json_is_unchanged(self):
+        text = '{"a": [1, 2], "b": {"c": null}}'
+        self.assertEqual(convert_json5_to_json(text), text)
+
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        patcher = mock.patch.object(json5_to_json, '_CACHE_DIR', os.path.join(self.dir, 'cache'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.input = os.path.join(self.dir, 'config.json5')
+        with open(self.input, 'w') as f:
+            f.write('{a: 1}')
+
+    def entry(self):
+        return json5_to_json._cache_entry(self.input, os.stat(self.input))
+
+    def test_hit_returns_stored_output(self):
+        cache_path, stamp = self.entry()
+        json5_to_json._write_cache(cache_path, stamp, b'{"a": 1}\n')
+        with json5_to_json._open_cached(*self.entry()) as f:
+            self.assertEqual(f.read(), b'{"a": 1}\n')
+
+    def test_changed_converter_misses(self):
+        cache_path, stamp = self.entry()
+        json5_to_json._write_cache(cache_path, stamp, b'old\n')
+        with mock.patch.object(json5_to_json, '_converter_digest', return_value=b'other'):
+            self.assertIsNone(json5_to_json._open_cached(*self.entry()))
+
+    def test_changed_input_replaces_entry(self):
+        json5_to_json._write_cache(*self.entry(), b'old\n')
+        with open(self.input, 'w') as f:
+            f.write('{a: 22}')
+        self.assertIsNone(json5_to_json._open_cached(*self.entry()))
+        json5_to_json._write_cache(*self.entry(), b'new\n')
+        self.assertEqual(len(os.listdir(json5_to_json._CACHE_DIR)), 1)
+
+    def test_directory_is_bounded(self):
+        for i in range(json5_to_json._CACHE_MAX + 5):
+            json5_to_json._write_cache(os.path.join(json5_to_json._CACHE_DIR, str(i)), b'x\n', b'{}')
+        self.assertEqual(len(os.listdir(json5_to_json._CACHE_DIR)), json5_to_json._CACHE_MAX)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,257 @@
+"""Tests for the viewer's HTTP server"""
+import asyncio
+import http.client
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+
+_GIT_IDENTITY = {
+    'GIT_AUTHOR_NAME': 'Test', 'GIT_AUTHOR_EMAIL': 'test@example.com',
+    'GIT_COMMITTER_NAME': 'Test', 'GIT_COMMITTER_EMAIL': 'test@example.com',
+}
+
+
+def _git(*args, cwd=None):
+    subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True,
+                   env={**os.environ, **_GIT_IDENTITY})
+
+
+class ServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = cls.tmp.name
+        # A remote with one commit on dev
+        cls.remote = os.path.join(root, 'remote.git')
+        work = os.path.join(root, 'work')
+        _git('init', '-q', '--bare', cls.remote)
+        _git('init', '-q', work)
+        _git('commit', '-q', '--allow-empty', '-m', 'first', cwd=work)
+        _git('push', '-q', cls.remote, 'HEAD:refs/heads/dev', cwd=work)
+
+        # The server reads config.json5 from its working directory
+        cls.old_cwd = os.getcwd()
+        os.chdir(root)
+        with open('config.json5', 'w') as f:
+            f.write('{\n  repositories: [],\n}\n')
+
+        cls.httpd = server.GitTagServer(('127.0.0.1', 0), server.GitTagHandler)
+        threading.Thread(target=cls.httpd.serve_forever, daemon=True).start()
+        cls.base = f'http://127.0.0.1:{cls.httpd.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+        os.chdir(cls.old_cwd)
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        # Created only if a command smuggled into a request gets run
+        self.marker = os.path.join(self.tmp.name, f'pwned-{self._testMethodName}')
+
+    def get(self, path, **params):
+        """(status, decoded JSON body or None) for a GET request"""
+        try:
+            with urllib.request.urlopen(f'{self.base}{path}?{urlencode(params)}') as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    def raw_response(self, method, path, body=None):
+        """The http.client response to a request, whatever its status"""
+        conn = http.client.HTTPConnection('127.0.0.1', self.httpd.server_address[1], timeout=30)
+        self.addCleanup(conn.close)
+        conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        response.read()
+        return response
+
+    def post_bulk_tag(self, request):
+        """(status, list of NDJSON results or None) for a bulk-tag request"""
+        req = urllib.request.Request(
+            f'{self.base}/api/bulk-tag', data=json.dumps(request).encode(),
+            headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status, [json.loads(line) for line in response.read().splitlines()]
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    def remote_tag(self, tag_name):
+        result = subprocess.run(['git', 'ls-remote', self.remote, f'refs/tags/{tag_name}'],
+                                capture_output=True, text=True, check=True)
+        return result.stdout.split('\t')[0] or None
+
+    def test_commits_for_branch(self):
+        status, body = self.get('/api/commits', repo='r', baseUrl=self.remote, branch='dev')
+        self.assertEqual(status, 200)
+        self.assertEqual([commit['subject'] for commit in body['commits']], ['first'])
+
+    def test_commits_rejects_option_like_branch(self):
+        status, _ = self.get(
+            '/api/commits', repo='r', baseUrl=self.remote,
+            branch=f'--upload-pack=touch {self.marker}; git-upload-pack'
+        )
+        self.assertEqual(status, 400)
+        self.assertFalse(os.path.exists(self.marker))
+
+    def test_commits_rejects_option_like_base_url(self):
+        status, _ = self.get(
+            '/api/commits', repo='r', branch='dev',
+            baseUrl=f'--upload-pack=touch {self.marker}; git-upload-pack .git'
+        )
+        self.assertEqual(status, 400)
+        self.assertFalse(os.path.exists(self.marker))
+
+    def test_bad_parameters_do_not_split_the_response(self):
+        injected = '%0d%0aSet-Cookie:%20evil=1'
+        for path in [f'/api/commits?repo=r&branch=a{injected}',
+                     f'/api/commits?repo=r&branch=dev&baseUrl=-x{injected}',
+                     f'/api/tags?repo=r&baseUrl=-x{injected}',
+                     f'/api/branches?repo=r&baseUrl=-x{injected}',
+                     f'/api/commits?repo=r&branch=dev&limit=x{injected}']:
+            response = self.raw_response('GET', path)
+            self.assertIn(response.status, (400, 500), msg=path)
+            self.assertIsNone(response.getheader('Set-Cookie'), msg=path)
+            self.assertNotIn('evil', response.reason, msg=path)
+
+    def test_bulk_tag(self):
+        status, results = self.post_bulk_tag(
+            {'branch': 'dev', 'tag': 'v1', 'repos': [{'repo': 'r', 'baseUrl': self.remote}]}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual([(r['repo'], r['success']) for r in results], [('r', True)])
+        self.assertIsNotNone(self.remote_tag('v1'))
+
+    def test_bulk_tag_rejects_option_like_branch(self):
+        status, _ = self.post_bulk_tag({
+            'branch': f'--upload-pack=touch {self.marker}; git-upload-pack',
+            'tag': 'v2', 'repos': [{'repo': 'r', 'baseUrl': self.remote}]
+        })
+        self.assertEqual(status, 400)
+        self.assertFalse(os.path.exists(self.marker))
+        self.assertIsNone(self.remote_tag('v2'))
+
+    def test_bulk_tag_rejects_bad_tag(self):
+        status, _ = self.post_bulk_tag(
+            {'branch': 'dev', 'tag': '-f', 'repos': [{'repo': 'r', 'baseUrl': self.remote}]}
+        )
+        self.assertEqual(status, 400)
+
+    def test_bulk_tag_bad_names_do_not_split_the_response(self):
+        for request in [{'branch': 'a\r\nSet-Cookie: evil=1', 'tag': 'v6'},
+                        {'branch': 'dev', 'tag': 'a\r\nSet-Cookie: evil=1'}]:
+            request['repos'] = [{'repo': 'r', 'baseUrl': self.remote}]
+            response = self.raw_response('POST', '/api/bulk-tag', json.dumps(request))
+            self.assertEqual(response.status, 400, msg=request)
+            self.assertIsNone(response.getheader('Set-Cookie'), msg=request)
+            self.assertNotIn('evil', response.reason, msg=request)
+
+    def test_bulk_tag_rejects_option_like_base_url(self):
+        status, results = self.post_bulk_tag({'branch': 'dev', 'tag': 'v3', 'repos': [
+            {'repo': 'bad', 'baseUrl': f'--upload-pack=touch {self.marker}; git-upload-pack .git'},
+            {'repo': 'r', 'baseUrl': self.remote},
+        ]})
+        self.assertEqual(status, 200)
+        self.assertEqual(sorted((r['repo'], r['success']) for r in results),
+                         [('bad', False), ('r', True)])
+        self.assertFalse(os.path.exists(self.marker))
+
+    def test_bulk_tag_reports_each_bad_repo(self):
+        status, results = self.post_bulk_tag({'branch': 'dev', 'tag': 'v4', 'repos': [
+            {'baseUrl': self.remote},
+            {'repo': 'https://host/a/b.git', 'baseUrl': self.remote},
+            {'repo': 'r', 'baseUrl': 42},
+        ]})
+        self.assertEqual(status, 200)
+        self.assertEqual(sorted((str(r['repo']), r['success']) for r in results),
+                         [('None', False), ('https://host/a/b.git', True), ('r', False)])
+
+    def test_bulk_tag_finishes_after_client_goes_away(self):
+        other = os.path.join(self.tmp.name, 'other.git')
+        _git('clone', '-q', '--bare', self.remote, other)
+        # One repo at a time, so the second only starts after the first
+        # result failed to reach the client
+        with mock.patch.object(server, '_BULK_TAG_JOBS', 1), \
+             mock.patch.object(server.GitTagHandler, 'write_ndjson', side_effect=BrokenPipeError), \
+             self.assertLogs('gittag', 'WARNING') as logs:
+            with self.assertRaises(Exception):
+                self.post_bulk_tag({'branch': 'dev', 'tag': 'v5', 'repos': [
+                    {'repo': 'r', 'baseUrl': self.remote},
+                    {'repo': 'o', 'baseUrl': other},
+                ]})
+        self.assertIsNotNone(self.remote_tag('v5'))
+        result = subprocess.run(['git', 'ls-remote', other, 'refs/tags/v5'],
+                                capture_output=True, text=True, check=True)
+        self.assertTrue(result.stdout)
+        self.assertTrue(any('Unreported' in line for line in logs.output))
+
+
+class TagMatchesBranchTest(unittest.TestCase):
+    def test_ls_remote_timeout_is_no_match(self):
+        async def timing_out(args, timeout, cwd=None):
+            raise subprocess.TimeoutExpired(args, timeout)
+        with mock.patch.object(server, '_run_git', timing_out):
+            self.assertFalse(asyncio.run(server._tag_matches_branch('https://host/r.git', 'dev', 'v1')))
+
+
+class RemoteCacheTest(unittest.TestCase):
+    def setUp(self):
+        handler = server.GitTagHandler
+        for name, value in [('_remote_cache', {}), ('_REMOTE_CACHE_MAX', 4)]:
+            patcher = mock.patch.object(handler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_expired_entry_is_dropped(self):
+        handler = server.GitTagHandler
+        handler.set_remote_cache(('u', 'tags'), 'old', -1)
+        self.assertIsNone(handler.get_remote_cache(('u', 'tags')))
+        self.assertEqual(handler._remote_cache, {})
+
+    def test_size_is_bounded(self):
+        handler = server.GitTagHandler
+        handler.set_remote_cache(('expired', 'tags'), 'x', -1)
+        for i in range(10):
+            handler.set_remote_cache((f'u{i}', 'tags'), i, 30)
+        self.assertEqual(list(handler._remote_cache), [(f'u{i}', 'tags') for i in range(6, 10)])
+        self.assertEqual(handler.get_remote_cache(('u9', 'tags')), 9)
+
+
+class BulkTagJobsTest(unittest.TestCase):
+    def test_jobs_from_environment(self):
+        for value, jobs in [('4', 4), ('0', 1), ('', 16), ('many', 16)]:
+            with mock.patch.dict(os.environ, {'GIT_TAG_JOBS': value}):
+                self.assertEqual(server._bulk_tag_jobs(), jobs, msg=value)
+
+
+class RefNameTest(unittest.TestCase):
+    def test_branch_names(self):
+        server._check_branch_name('feature/x-1')
+        for name in ['', '-x', '--upload-pack=sh', 'a..b', 'a b', 'x.lock']:
+            with self.assertRaises(ValueError, msg=name):
+                server._check_branch_name(name)
+
+    def test_tag_names(self):
+        server._check_tag_name('v1.0')
+        for name in ['', '-x', '../heads/main', 'a:b', 'a^{}']:
+            with self.assertRaises(ValueError, msg=name):
+                server._check_tag_name(name)
+
+
+if __name__ == '__main__':
+    unittest.main()
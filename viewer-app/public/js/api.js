@@ -91,9 +91,10 @@ async function fetchRepoBranches(repo, config) {
  * @param {string} branchName - Branch name
  * @param {string} tagName - Tag name
  * @param {Array} repos - Array of repository objects
+ * @param {Function} [onResult] - Called with each repository's result as it arrives
  * @returns {Promise<Object>} Results of the operation
  */
-async function executeBulkTagOperation(branchName, tagName, repos) {
+async function executeBulkTagOperation(branchName, tagName, repos, onResult) {
     const response = await fetch('/api/bulk-tag', {
         method: 'POST',
         headers: {
@@ -106,6 +107,38 @@ async function executeBulkTagOperation(branchName, tagName, repos) {
         })
     });
 
-    return await response.json();
+    if (!response.ok) {
+        throw new Error(`Bulk tag request failed: ${response.status} ${response.statusText}`);
+    }
+
+    // The server streams one JSON result per line as each repo finishes
+    const results = [];
+    const handleLine = line => {
+        if (!line.trim()) {
+            return;
+        }
+        const result = JSON.parse(line);
+        results.push(result);
+        if (onResult) {
+            onResult(result);
+        }
+    };
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+        lines.forEach(handleLine);
+    }
+    handleLine(buffered + decoder.decode());
+
+    return { results: results };
 }
 
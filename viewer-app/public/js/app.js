@@ -692,7 +692,7 @@ async function handleExecuteBulkTag() {
     showBulkTagProgress();
 
     try {
-        const data = await executeBulkTagOperation(branchName, tagName, reposToTag);
+        const data = await executeBulkTagOperation(branchName, tagName, reposToTag, appendBulkTagResult);
 
         // Display results
         const successCount = renderBulkTagProgress(data);
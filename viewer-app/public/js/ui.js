@@ -14,6 +14,18 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
+/**
+ * Format a commit timestamp as local "YYYY-MM-DD HH:MM:SS"
+ * @param {number} timestamp - Unix timestamp in seconds
+ * @returns {string} Formatted date
+ */
+function formatCommitDate(timestamp) {
+    const date = new Date(timestamp * 1000);
+    const pad = n => String(n).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())} ` +
+        `${pad(date.getHours())}:${pad(date.getMinutes())}:${pad(date.getSeconds())}`;
+}
+
 /**
  * Show loading state
  */
@@ -258,7 +270,7 @@ function renderCommits(index, repo, commits, branch) {
                     <div class="commit-item">
                         <div class="commit-header">
                             <span class="commit-hash">${escapeHtml(commit.shortHash)}</span>
-                            <span class="commit-date">${escapeHtml(commit.date)}</span>
+                            <span class="commit-date">${escapeHtml(formatCommitDate(commit.timestamp))}</span>
                         </div>
                         <div class="commit-subject">${escapeHtml(commit.subject)}</div>
                         ${tags.length > 0 ? `
@@ -417,10 +429,10 @@ function renderBulkTagProgress(data) {
     data.results.forEach(result => {
         if (result.success) {
             successCount++;
-            logHtml += `<div class="progress-log-line success">✓ ${result.repo}: ${result.message}</div>`;
+            logHtml += `<div class="progress-log-line success">✓ ${escapeHtml(result.repo)}: ${escapeHtml(result.message)}</div>`;
         } else {
             failCount++;
-            logHtml += `<div class="progress-log-line error">✗ ${result.repo}: ${result.error}</div>`;
+            logHtml += `<div class="progress-log-line error">✗ ${escapeHtml(result.repo)}: ${escapeHtml(result.error)}</div>`;
         }
     });
 
@@ -430,6 +442,19 @@ function renderBulkTagProgress(data) {
     return successCount;
 }
 
+/**
+ * Append one repository's bulk tag result to the progress log as it arrives
+ * @param {Object} result - Result for a single repository
+ */
+function appendBulkTagResult(result) {
+    const progressLog = document.getElementById('progressLog');
+    if (result.success) {
+        progressLog.insertAdjacentHTML('beforeend', `<div class="progress-log-line success">✓ ${escapeHtml(result.repo)}: ${escapeHtml(result.message)}</div>`);
+    } else {
+        progressLog.insertAdjacentHTML('beforeend', `<div class="progress-log-line error">✗ ${escapeHtml(result.repo)}: ${escapeHtml(result.error)}</div>`);
+    }
+}
+
 /**
  * Show bulk tag progress initialization
  */
@@ -445,5 +470,5 @@ function showBulkTagProgress() {
  */
 function showBulkTagError(message) {
     const progressLog = document.getElementById('progressLog');
-    progressLog.innerHTML += `<div class="progress-log-line error">Error: ${message}</div>`;
+    progressLog.insertAdjacentHTML('beforeend', `<div class="progress-log-line error">Error: ${escapeHtml(message)}</div>`);
 }